@@ -1,51 +1,145 @@
 import re
-import jieba
-import jieba.posseg as pseg
-from collections import defaultdict
+try:
+    # jieba_fast 为 jieba 的 Cython 加速版，接口与词典格式完全兼容
+    import jieba_fast as jieba
+    import jieba_fast.posseg as pseg
+    import jieba_fast.finalseg as finalseg
+except ImportError:
+    import jieba
+    import jieba.posseg as pseg
+    import jieba.finalseg as finalseg
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 import os
 import json  # 用于保存设置
+import threading  # 后台处理，避免界面卡顿
+import multiprocessing  # 长文章按段落并行处理
+
+# 预编译的正则表达式，避免每次调用时重复查找/编译
+_REDUNDANT_RE = re.compile(r'当.*?时，?|尽管.*?，?|虽然.*?但是')  # 时间状语等冗余成分
+_SENT_RE = re.compile(r'([^。！？]*)([。！？]+|$)')  # 逐句匹配：句子主体 + 连续的句末标点（段末可缺省）
+_WS_RE = re.compile(r'\s+')  # 同义词库行内分隔符
+
+_KEEP_POS = frozenset('nva')  # 浓缩时保留的词性首字母：名词、动词、形容词
+_KEEP_CONJ = frozenset(('但是', '然而'))  # 浓缩时保留的转折连词
+
+# 文章字符数达到该值时才使用进程池。单进程每秒约处理数万字，而每个子进程启动时需重新初始化 jieba、
+# 构建字典树，耗时一秒以上、内存约 170MB，只有足够长的文章才值得分发
+_PARALLEL_MIN_CHARS = 200000
+# 进程池大小上限，控制内存占用；只有一个 CPU 时为 1，此时不使用进程池
+_POOL_SIZE = min(os.cpu_count() or 1, 4)
+
+_TRIE_END = ''  # 字典树中标记词尾的键（空串不会与任何单字冲突），值为替换词
 
 
 # 定义文章处理类
 class ArticleProcessor:
-    def __init__(self, synonym_path, synonym_freq=1000):
+    # jieba 词典为进程内共享：记录同义词库写入前的总词频与各原词的原词频（不存在记为 0），
+    # 切换处理器时先恢复该状态再写入，使分词结果与处理器的使用顺序无关
+    _jieba_base_total = None
+    _jieba_base_freq = {}
+    _jieba_forced = set()  # 因词频为 0 而被强制拆分的原词
+    _jieba_owner = None  # 最近一次写入 jieba 词典的处理器
+    # 已解析的同义词库缓存，键为文件路径，值为 (修改时间, 同义词字典, 字典树)；文件修改后替换对应条目
+    _parse_cache = {}
+
+    def __init__(self, synonym_path, synonym_freq=1000, synonyms=None):
         """
         初始化文章处理器
         :param synonym_path: 同义词文件路径（格式：原词 空格 替换词）
         :param synonym_freq: 添加到分词词典的词频
+        :param synonyms: 已解析的同义词字典；给出时直接使用，不再读取 synonym_path
         """
-        self.synonyms = defaultdict(list)  # 用于存储同义词库数据
+        self.synonyms = {}  # 用于存储同义词库数据：原词 -> 替换词
+        self.trie = {}  # 同义词匹配字典树
+        self.synonym_path = synonym_path
         self.synonym_freq = synonym_freq
-        self.load_synonyms(synonym_path)  # 加载同义词库
+        self.load_error = None  # 同义词库载入失败时记录异常，由调用方负责提示
+        if synonyms is None:
+            self.load_synonyms(synonym_path)  # 加载同义词库并构建字典树
+        else:
+            self.synonyms, self.trie = synonyms, self._build_trie(synonyms)
+        self._trigger_chars = frozenset(self.trie)  # 所有原词的首字
         self._init_jieba()  # 初始化 jieba 分词配置
 
+    @staticmethod
+    def _build_trie(synonyms):
+        """
+        将同义词库中的原词构建为按字符嵌套的字典树，替换时逐字下探即可找到最长匹配
+        :param synonyms: 同义词字典（原词 -> 替换词）
+        :return: 字典树根节点
+        """
+        trie = {}
+        for orig, replace in synonyms.items():
+            node = trie
+            for ch in orig:
+                node = node.setdefault(ch, {})
+            node[_TRIE_END] = replace
+        return trie
+
     def _init_jieba(self):
         """
-        将同义词库中的词加入 jieba 分词词典，确保分词时不会错误拆分
+        将同义词库中的词加入 jieba 分词词典，确保分词时不会错误拆分。
+        先完成 jieba 初始化，再直接批量写入其前缀词典，效果等同于逐个调用 jieba.add_word
         """
-        for word in self.synonyms.keys():
-            jieba.add_word(word, freq=self.synonym_freq)
         jieba.initialize()
+        self._restore_jieba()
+        freq_dict = jieba.dt.FREQ
+        base_freq = ArticleProcessor._jieba_base_freq
+        freq = int(self.synonym_freq)
+        total = 0
+        for word in self.synonyms:
+            base_freq.setdefault(word, freq_dict.get(word, 0))
+            freq_dict[word] = freq
+            total += freq
+            for i in range(1, len(word)):
+                freq_dict.setdefault(word[:i], 0)
+            if freq == 0:
+                finalseg.add_force_split(word)  # 与 jieba.add_word 一致：词频为 0 时强制拆分该词
+        if freq == 0:
+            ArticleProcessor._jieba_forced.update(self.synonyms)
+        jieba.dt.total += total
+        ArticleProcessor._jieba_owner = self
+
+    @staticmethod
+    def _restore_jieba():
+        """
+        撤销此前处理器写入 jieba 词典的词频与强制拆分，恢复到未写入同义词库时的状态
+        """
+        if ArticleProcessor._jieba_base_total is None:
+            ArticleProcessor._jieba_base_total = jieba.dt.total
+            return
+        freq_dict = jieba.dt.FREQ
+        for word, orig in ArticleProcessor._jieba_base_freq.items():
+            freq_dict[word] = orig
+        jieba.dt.total = ArticleProcessor._jieba_base_total
+        for word in ArticleProcessor._jieba_forced:
+            finalseg.Force_Split_Words.discard(word)
+        ArticleProcessor._jieba_forced.clear()
 
     def load_synonyms(self, path):
         """
         从文件中加载同义词库，文件格式要求：每行两个词，以空格隔开，第一个为原词，第二个为替换词
+        词库文件未修改时直接复用已解析的结果，不再重复读取与构建字典树
         :param path: 同义词库文件路径
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    parts = re.split(r'\s+', line, 1)
-                    if len(parts) == 2:
-                        orig, replace = parts
-                        self.synonyms[orig].append(replace)
+            mtime = os.path.getmtime(path)
+            cached = ArticleProcessor._parse_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                with open(path, 'r', encoding='utf-8', buffering=1 << 16) as f:
+                    data = f.read()
+                synonyms = {}
+                for line in data.splitlines():
+                    parts = _WS_RE.split(line.strip(), 1)
+                    # 同一原词出现多次时以第一条为准
+                    if len(parts) == 2 and parts[0] not in synonyms:
+                        synonyms[parts[0]] = parts[1]
+                cached = (mtime, synonyms, self._build_trie(synonyms))
+                ArticleProcessor._parse_cache[path] = cached  # 覆盖旧版本，不保留过期的词库
+            _, self.synonyms, self.trie = cached
         except Exception as e:
-            messagebox.showerror("错误", f"加载同义词库失败：{e}")
+            self.load_error = e
 
     def _condense_sentence(self, sentence):
         """
@@ -55,86 +149,116 @@ class ArticleProcessor:
         :param sentence: 原始句子
         :return: 浓缩后的句子
         """
-        sentence = re.sub(r'当.*?时，?|尽管.*?，?|虽然.*?但是', '', sentence)
+        sentence = _REDUNDANT_RE.sub('', sentence)
         words = pseg.cut(sentence)
         kept_words = []
         for word, pos in words:
-            if pos[0] in ['n', 'v', 'a'] and len(word) > 1:
+            if pos[0] in _KEEP_POS and len(word) > 1:
                 kept_words.append(word)
-            elif word in ["但是", "然而"]:
+            elif word in _KEEP_CONJ:
                 kept_words.append(word)
         if not kept_words:
             return ""
         condensed = []
+        seen = set()  # 与 condensed 同步，用于 O(1) 判重
         for i in range(len(kept_words)):
-            if i > 0 and kept_words[i - 1] in ["但是", "然而"]:
+            if i > 0 and kept_words[i - 1] in _KEEP_CONJ:
                 condensed.append(kept_words[i])
-            elif kept_words[i] not in condensed:
+                seen.add(kept_words[i])
+            elif kept_words[i] not in seen:
                 condensed.append(kept_words[i])
+                seen.add(kept_words[i])
         return "".join(condensed)
 
     def _replace_words(self, text):
         """
         对文本进行同义词替换：
-        1. 采用 jieba 分词后，若词出现在同义词库中，则替换为对应的替换词。
-        2. 为保证长词优先替换，先按照词长降序匹配原词。
+        1. 先用 jieba 分词，替换只能从词的边界开始、到词的边界结束，不会替换词语内部的片段。
+        2. 在每个词的起点沿字典树逐字下探，遇到不匹配的字符即停止。
+        3. 记录下探过程中落在词边界上的最深词尾节点，保证长词优先替换。
         :param text: 待处理文本
         :return: 替换后的文本
         """
+        if self._trigger_chars.isdisjoint(text):
+            return text  # 文本中不含任何原词的首字，无需分词和替换
         words = jieba.lcut(text)
+        bounds = {0}  # 所有词边界在文本中的偏移
+        pos = 0
+        for word in words:
+            pos += len(word)
+            bounds.add(pos)
+        trie = self.trie
         replaced = []
-        current_index = 0
+        last = 0  # 尚未输出的原文起点
+        i, n = 0, len(text)
         for word in words:
-            if word in self.synonyms:
-                replaced_flag = False
-                for orig in sorted(self.synonyms.keys(), key=lambda x: len(x), reverse=True):
-                    if text.startswith(orig, current_index):
-                        replaced.append(self.synonyms[orig][0])
-                        current_index += len(orig)
-                        replaced_flag = True
-                        break
-                if not replaced_flag:
-                    replaced.append(self.synonyms[word][0])
-                    current_index += len(word)
-            else:
-                replaced.append(word)
-                current_index += len(word)
+            start, i = i, i + len(word)
+            if start < last:
+                continue  # 该词已被前面更长的匹配覆盖
+            node = trie.get(text[start])
+            best = None
+            j = start + 1
+            while node is not None:
+                if _TRIE_END in node and j in bounds:
+                    best = (j, node[_TRIE_END])
+                if j == n:
+                    break
+                node = node.get(text[j])
+                j += 1
+            if best is None:
+                continue
+            replaced.append(text[last:start])
+            replaced.append(best[1])
+            last = best[0]
+        replaced.append(text[last:])
         return ''.join(replaced)
 
+    def _process_paragraph(self, para):
+        """
+        处理单个段落：逐句浓缩并进行同义词替换
+        :param para: 段落文本（不含换行符）
+        :return: (处理后的段落, 该段落的对照列表)
+        """
+        if not para or para.isspace():
+            return "", []
+        parts = []
+        contrast_pairs = []
+        for m in _SENT_RE.finditer(para):
+            orig_sentence, term = m.group(1).strip(), m.group(2)
+            if not orig_sentence:
+                parts.append(term)  # 没有句子主体的标点（如“？！”中的“！”）原样保留
+                continue
+            condensed = self._condense_sentence(orig_sentence)
+            replaced = self._replace_words(condensed)
+            parts.append(replaced)
+            parts.append(term)
+            if replaced:
+                contrast_pairs.append((orig_sentence, term, replaced))
+        return ''.join(parts), contrast_pairs
+
     def process(self, text, contrast=False):
         """
         处理全文：
           1. 保留原有段落结构
-          2. 对每个句子进行浓缩和同义词替换
+          2. 对每个句子进行浓缩和同义词替换，文章较长时按段落分发到多个进程并行处理
           3. 可选生成每个句子修改前后的对照信息
         :param text: 原始文章文本
         :param contrast: 是否生成句子修改前后对照结果
-        :return: 返回处理后的文本及（可选的）对照列表；对照列表元素格式为 (原始句子, 修改后句子)
+        :return: 返回处理后的文本及（可选的）对照列表；对照列表元素格式为 (原始句子, 句末标点, 修改后句子)
         """
+        if ArticleProcessor._jieba_owner is not self:
+            self._init_jieba()  # 期间其他处理器改写过 jieba 词典，重新写入本处理器的设置
         paragraphs = text.split('\n')
+        if _POOL_SIZE > 1 and len(text) >= _PARALLEL_MIN_CHARS and len(paragraphs) > 1:
+            pool = _get_pool(self.synonym_path, self.synonyms, self.synonym_freq)
+            results = pool.map(_process_paragraph, paragraphs)
+        else:
+            results = map(self._process_paragraph, paragraphs)
         processed_paragraphs = []
         contrast_pairs = []
-
-        for para in paragraphs:
-            if not para.strip():
-                processed_paragraphs.append("")
-                continue
-            sentences = re.split(r'([。！？])', para)
-            new_sentences = []
-            buffer = []
-            for seg in sentences:
-                if seg in ["。", "！", "？"]:
-                    if buffer:
-                        orig_sentence = ''.join(buffer).strip()
-                        condensed = self._condense_sentence(orig_sentence)
-                        replaced = self._replace_words(condensed)
-                        new_sentences.append(replaced + seg)
-                        if orig_sentence and replaced:
-                            contrast_pairs.append((orig_sentence + seg, replaced + seg))
-                        buffer = []
-                else:
-                    buffer.append(seg)
-            processed_paragraphs.append(''.join(new_sentences))
+        for processed_para, para_pairs in results:
+            processed_paragraphs.append(processed_para)
+            contrast_pairs.extend(para_pairs)
         processed_text = '\n'.join(processed_paragraphs)
         if contrast:
             return processed_text, contrast_pairs
@@ -142,6 +266,39 @@ class ArticleProcessor:
             return processed_text
 
 
+# 子进程中使用的文章处理器，由 _init_worker 在进程池启动时创建
+_worker_processor = None
+
+# 全进程共享的进程池，以及创建它时使用的 (同义词字典, 词频)
+_pool = None
+_pool_lexicon = None
+
+
+def _get_pool(synonym_path, synonyms, synonym_freq):
+    """
+    获取共享进程池；同义词库或词频与现有进程池不一致时重建。
+    子进程直接使用父进程已解析的同义词字典，保证长短文章使用同一份词库
+    """
+    global _pool, _pool_lexicon
+    if _pool is not None and (_pool_lexicon[0] is not synonyms or _pool_lexicon[1] != synonym_freq):
+        _pool.terminate()
+        _pool = None
+    if _pool is None:
+        _pool = multiprocessing.Pool(_POOL_SIZE, initializer=_init_worker,
+                                     initargs=(synonym_path, synonyms, synonym_freq))
+        _pool_lexicon = (synonyms, synonym_freq)
+    return _pool
+
+
+def _init_worker(synonym_path, synonyms, synonym_freq):
+    global _worker_processor
+    _worker_processor = ArticleProcessor(synonym_path, synonym_freq=synonym_freq, synonyms=synonyms)
+
+
+def _process_paragraph(para):
+    return _worker_processor._process_paragraph(para)
+
+
 # 定义 GUI 应用类
 class ArticleApp:
     def __init__(self, root):
@@ -160,6 +317,9 @@ class ArticleApp:
         self.contrast = tk.BooleanVar(value=self.settings.get("contrast", False))
         self.font_size = tk.IntVar(value=self.settings.get("font_size", 12))
 
+        # 已构建的处理器缓存，键为 (同义词库路径, 词频)，避免每次处理都重新加载词库
+        self._processor_cache = {}
+
         # 构建界面
         self.build_interface()
 
@@ -197,8 +357,12 @@ class ArticleApp:
 
         btn_frame = tk.Frame(self.root)
         btn_frame.pack(padx=10, pady=5)
-        tk.Button(btn_frame, text="开始处理", command=self.start_processing).pack(side=tk.LEFT, padx=5)
-        tk.Button(btn_frame, text="清空", command=self.clear_text).pack(side=tk.LEFT, padx=5)
+        self.process_button = tk.Button(btn_frame, text="开始处理", command=self.start_processing)
+        self.process_button.pack(side=tk.LEFT, padx=5)
+        self.clear_button = tk.Button(btn_frame, text="清空", command=self.clear_text)
+        self.clear_button.pack(side=tk.LEFT, padx=5)
+        self.reload_button = tk.Button(btn_frame, text="重新载入词库", command=self.reload_lexicon)
+        self.reload_button.pack(side=tk.LEFT, padx=5)
 
         input_frame = tk.Frame(self.root)
         input_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -229,29 +393,65 @@ class ArticleApp:
                 self.input_text.delete(1.0, tk.END)
                 self.input_text.insert(tk.END, f.read())
 
+    def get_processor(self, key):
+        processor = self._processor_cache.get(key)
+        if processor is None:
+            processor = ArticleProcessor(key[0], synonym_freq=key[1])
+            if processor.load_error is None:  # 载入失败的处理器不缓存，下次处理时重新尝试
+                self._processor_cache[key] = processor
+        return processor
+
+    def reload_lexicon(self):
+        self._processor_cache.clear()
+        messagebox.showinfo("提示", "词库将在下次处理时重新载入。")
+
     def start_processing(self):
         article_text = self.input_text.get(1.0, tk.END).strip()
         if not article_text:
             messagebox.showwarning("提示", "请输入文章内容或载入文件。")
             return
-        processor = ArticleProcessor(self.synonym_path.get(), synonym_freq=self.frequency.get())
+        key = (self.synonym_path.get(), self.frequency.get())
+        self._set_busy(True)
+        threading.Thread(target=self._run_process, args=(key, article_text, self.contrast.get()),
+                         daemon=True).start()
+
+    def _set_busy(self, busy):
+        # 处理期间禁用会改动处理器或文本框的按钮
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.process_button, self.clear_button, self.reload_button):
+            button.configure(state=state)
+
+    def _run_process(self, key, article_text, contrast):
+        # 在后台线程中执行（包括首次构建处理器），界面更新统一通过 root.after 交回主线程
         try:
-            if self.contrast.get():
+            processor = self.get_processor(key)
+            if processor.load_error is not None:
+                self.root.after(0, messagebox.showerror, "错误", f"加载同义词库失败：{processor.load_error}")
+            if contrast:
                 processed_text, contrast_pairs = processor.process(article_text, contrast=True)
             else:
-                processed_text = processor.process(article_text)
+                processed_text, contrast_pairs = processor.process(article_text), []
         except Exception as e:
-            messagebox.showerror("错误", f"处理文章时出错：{e}")
+            self.root.after(0, self._show_error, e)
             return
+        self.root.after(0, self._show_result, processed_text, contrast_pairs, contrast)
 
+    def _show_error(self, e):
+        self._set_busy(False)
+        messagebox.showerror("错误", f"处理文章时出错：{e}")
+
+    def _show_result(self, processed_text, contrast_pairs, contrast):
+        self._set_busy(False)
         self.result_text.delete(1.0, tk.END)
         self.result_text.insert(tk.END, processed_text)
 
-        if self.contrast.get():
+        if contrast:
             self.contrast_text.delete(1.0, tk.END)
-            self.contrast_text.insert(tk.END, "=== 原句与处理后句对照 ===\n")
-            for idx, (orig, new) in enumerate(contrast_pairs, start=1):
-                self.contrast_text.insert(tk.END, f"句子 {idx}:\n原句：{orig}\n处理后：{new}\n{'-' * 40}\n")
+            # 先拼接完整文本再一次性插入，避免每句一次 insert 引起控件反复重排
+            buf = ["=== 原句与处理后句对照 ===\n"]
+            for idx, (orig, term, new) in enumerate(contrast_pairs, start=1):
+                buf.append(f"句子 {idx}:\n原句：{orig}{term}\n处理后：{new}{term}\n{'-' * 40}\n")
+            self.contrast_text.insert(tk.END, ''.join(buf))
             if not self.contrast_text.winfo_ismapped():
                 self.contrast_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         else:
@@ -266,6 +466,7 @@ class ArticleApp:
 
 # 主程序入口
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 打包为 exe 后子进程启动所需
     root = tk.Tk()
     app = ArticleApp(root)
     root.mainloop()
\ No newline at end of file